@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from pathlib import Path
@@ -14,11 +18,23 @@ from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 from meteostat import Point, daily, stations
 
+try:
+    import orjson  # optional: ~5-10x faster JSON encode/decode
+except ImportError:
+    orjson = None
+
 STATION_ID_RE = re.compile(r"\(([^)]+)\)")
 CORE_KEYS = ("temp_min_c", "temp_avg_c", "temp_max_c", "rain_mm", "humidity_pct", "wind_avg_kph")
 CLIMATE_KEYS = (*CORE_KEYS, "sunshine_hours")
 REQUIRED_DAILY_COLUMNS = ("temp", "rhum", "prcp", "wspd", "tsun")
 
+# Guards the shared daily-frame cache when station probing runs in threads.
+DAILY_CACHE_LOCK = threading.Lock()
+NEARBY_CACHE_LOCK = threading.Lock()
+
+# Per-process view of {cache_dir}/nearby.json, loaded lazily.
+_nearby_disk_caches: Dict[Path, Dict[str, list]] = {}
+
 
 @dataclass
 class CliOptions:
@@ -30,6 +46,9 @@ class CliOptions:
     overwrite_climate: bool
     dry_run: bool
     sleep_ms: int
+    cache_dir: Optional[Path]
+    cache_ttl_days: int
+    freshness_days: int
 
 
 def parse_args(argv: list[str]) -> CliOptions:
@@ -48,6 +67,9 @@ def parse_args(argv: list[str]) -> CliOptions:
     parser.add_argument("--sleepMs", type=int, default=120)
     parser.add_argument("--dryRun", action="store_true")
     parser.add_argument("--noOverwriteClimate", action="store_true")
+    parser.add_argument("--cacheDir", default=".cache/meteostat")
+    parser.add_argument("--cacheTtlDays", type=int, default=30)
+    parser.add_argument("--freshnessDays", type=int, default=30)
     args = parser.parse_args(argv)
 
     current_year = datetime.now(timezone.utc).year
@@ -73,11 +95,51 @@ def parse_args(argv: list[str]) -> CliOptions:
         overwrite_climate=not args.noOverwriteClimate,
         dry_run=bool(args.dryRun),
         sleep_ms=max(0, int(args.sleepMs)),
+        cache_dir=Path(args.cacheDir).resolve() if str(args.cacheDir).strip() else None,
+        cache_ttl_days=max(0, int(args.cacheTtlDays)),
+        freshness_days=max(0, int(args.freshnessDays)),
     )
 
 
+def loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json_pretty(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return f"{json.dumps(payload, indent=2, ensure_ascii=True)}\n".encode("utf-8")
+
+
+def is_fresh(timestamp: Any, fetched_at: str, freshness_days: int) -> bool:
+    if freshness_days <= 0 or not isinstance(timestamp, str) or not timestamp:
+        return False
+    try:
+        updated = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        now = datetime.fromisoformat(fetched_at.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return (now - updated).total_seconds() <= freshness_days * 86400
+
+
+def months_are_fresh(payload: Dict[str, Any], fetched_at: str, freshness_days: int) -> bool:
+    for month_row in payload.get("months", []):
+        raw = month_row.get("raw")
+        if not isinstance(raw, dict):
+            continue
+        if any(raw.get(key) is None for key in CORE_KEYS):
+            return False
+        if not is_fresh(month_row.get("climate_last_updated"), fetched_at, freshness_days):
+            return False
+    return True
+
+
 def parse_station_id(source_name: str) -> Optional[str]:
-    if not source_name:
+    # Cheap substring check saves the regex scan for the common case of a
+    # source string without any "(station id)" suffix.
+    if not source_name or "(" not in source_name:
         return None
     match = STATION_ID_RE.search(source_name)
     if not match:
@@ -101,54 +163,176 @@ def ensure_daily_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def month_year_arrays(df: pd.DataFrame) -> Tuple[Any, Any]:
+    """Month/year arrays for the frame's index, computed once and reused.
+
+    Every .index.month / .index.year access allocates a fresh int array from
+    the datetime64 data; caching in df.attrs lets station_score and
+    aggregate_months share one copy per station frame.
+    """
+    arrays = df.attrs.get("_month_year")
+    if arrays is None:
+        arrays = (df.index.month.values, df.index.year.values)
+        df.attrs["_month_year"] = arrays
+    return arrays
+
+
 def station_score(df: pd.DataFrame, min_days_per_month: int) -> Tuple[int, int]:
-    complete_months = 0
-    total_non_null = 0
+    month_arr, _ = month_year_arrays(df)
+    monthly = df[["temp", "rhum", "prcp", "wspd"]].notna().groupby(month_arr).sum()
+    monthly = monthly.reindex(range(1, 13), fill_value=0)
+    complete_months = int((monthly >= min_days_per_month).all(axis=1).sum())
+    total_non_null = int(monthly.values.sum())
+    return complete_months, total_non_null
+
+
+def aggregate_months(df: pd.DataFrame) -> Dict[int, Dict[str, Optional[float]]]:
+    """Aggregate all 12 climate months in one pass over the daily frame."""
+    empty_row = {key: None for key in CLIMATE_KEYS}
+    if df.empty:
+        return {month: dict(empty_row) for month in range(1, 13)}
 
+    num = df[list(REQUIRED_DAILY_COLUMNS)].apply(pd.to_numeric, errors="coerce")
+    month_index, year_index = month_year_arrays(df)
+    by_month = num.groupby(month_index)
+
+    temp_min = by_month["temp"].min()
+    temp_mean = by_month["temp"].mean()
+    temp_max = by_month["temp"].max()
+    rhum_mean = by_month["rhum"].mean()
+    wspd_mean = by_month["wspd"].mean()
+    # Meteostat daily tsun is sunshine duration in minutes.
+    tsun_mean = by_month["tsun"].mean() / 60.0
+
+    # Monthly rain: sum per (year, month), then mean across years.
+    prcp_year_sum = num["prcp"].groupby([year_index, month_index]).sum(min_count=1)
+    rain_mean = prcp_year_sum.groupby(level=1).mean()
+
+    result: Dict[int, Dict[str, Optional[float]]] = {}
     for month in range(1, 13):
-        month_df = df[df.index.month == month]
-        month_counts = [int(month_df[field].notna().sum()) for field in ("temp", "rhum", "prcp", "wspd")]
-        total_non_null += sum(month_counts)
-        if all(count >= min_days_per_month for count in month_counts):
-            complete_months += 1
+        if month not in temp_mean.index:
+            result[month] = dict(empty_row)
+            continue
+        result[month] = {
+            "temp_min_c": round_or_none(temp_min.get(month)),
+            "temp_avg_c": round_or_none(temp_mean.get(month)),
+            "temp_max_c": round_or_none(temp_max.get(month)),
+            "rain_mm": round_or_none(rain_mean.get(month)),
+            "humidity_pct": round_or_none(rhum_mean.get(month)),
+            "wind_avg_kph": round_or_none(wspd_mean.get(month)),
+            "sunshine_hours": round_or_none(tsun_mean.get(month)),
+        }
+    return result
+
+
+def read_daily_cache_file(cache_file: Path, ttl_days: int) -> Optional[pd.DataFrame]:
+    try:
+        if not cache_file.exists():
+            return None
+        if time.time() - cache_file.stat().st_mtime > ttl_days * 86400:
+            return None
+        df = pd.read_parquet(cache_file)
+        return df if not df.empty else None
+    except Exception:
+        return None
 
-    return complete_months, total_non_null
+
+def write_daily_cache_file(cache_file: Path, df: pd.DataFrame) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache_file, compression="zstd")
+    except Exception:
+        # Cache writes are best-effort (e.g. no parquet engine installed).
+        pass
 
 
-def aggregate_month(df: pd.DataFrame, month: int) -> Dict[str, Optional[float]]:
-    month_df = df[df.index.month == month]
-    if month_df.empty:
-        return {key: None for key in CLIMATE_KEYS}
+@functools.lru_cache(maxsize=4096)
+def fetch_nearby_station_ids(lat_r: float, lon_r: float, max_candidates: int) -> Tuple[str, ...]:
+    nearby = stations.nearby(Point(lat_r, lon_r)).head(max_candidates)
+    return tuple(str(station_id) for station_id in nearby.index.tolist())
 
-    temp = pd.to_numeric(month_df["temp"], errors="coerce").dropna()
-    rhum = pd.to_numeric(month_df["rhum"], errors="coerce").dropna()
-    wspd = pd.to_numeric(month_df["wspd"], errors="coerce").dropna()
-    prcp = pd.to_numeric(month_df["prcp"], errors="coerce").dropna()
-    tsun = pd.to_numeric(month_df["tsun"], errors="coerce").dropna()
 
-    rain_mm: Optional[float]
-    if prcp.empty:
-        rain_mm = None
-    else:
-        by_year = prcp.groupby(prcp.index.year).sum(min_count=1)
-        rain_mm = round_or_none(by_year.mean())
+def load_nearby_cache(cache_dir: Optional[Path]) -> Optional[Dict[str, list]]:
+    if cache_dir is None:
+        return None
+    with NEARBY_CACHE_LOCK:
+        cached = _nearby_disk_caches.get(cache_dir)
+        if cached is None:
+            try:
+                cached = loads_json((cache_dir / "nearby.json").read_bytes())
+                if not isinstance(cached, dict):
+                    cached = {}
+            except Exception:
+                cached = {}
+            _nearby_disk_caches[cache_dir] = cached
+    return cached
+
+
+def save_nearby_cache(cache_dir: Path, cache: Dict[str, list]) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / "nearby.json").write_bytes(dumps_json_pretty(cache))
+    except Exception:
+        # Cache writes are best-effort.
+        pass
 
-    sunshine_hours: Optional[float]
-    if tsun.empty:
-        sunshine_hours = None
-    else:
-        # Meteostat daily tsun is sunshine duration in minutes.
-        sunshine_hours = round_or_none(tsun.mean() / 60.0)
 
-    return {
-        "temp_min_c": round_or_none(temp.min() if not temp.empty else None),
-        "temp_avg_c": round_or_none(temp.mean() if not temp.empty else None),
-        "temp_max_c": round_or_none(temp.max() if not temp.empty else None),
-        "rain_mm": rain_mm,
-        "humidity_pct": round_or_none(rhum.mean() if not rhum.empty else None),
-        "wind_avg_kph": round_or_none(wspd.mean() if not wspd.empty else None),
-        "sunshine_hours": sunshine_hours,
-    }
+def nearby_station_ids(lat: float, lon: float, max_candidates: int, cache_dir: Optional[Path]) -> Tuple[str, ...]:
+    """Nearby-station lookup memoized on ~1 km rounded coordinates.
+
+    Co-located cities share one metadata query per run, and the result is
+    persisted to {cacheDir}/nearby.json so later runs skip it entirely.
+    """
+    lat_r = round(lat, 2)
+    lon_r = round(lon, 2)
+    key = f"{lat_r:.2f},{lon_r:.2f},{max_candidates}"
+
+    disk_cache = load_nearby_cache(cache_dir)
+    if disk_cache is not None:
+        cached = disk_cache.get(key)
+        if isinstance(cached, list):
+            return tuple(str(station_id) for station_id in cached)
+
+    station_ids = fetch_nearby_station_ids(lat_r, lon_r, max_candidates)
+    if disk_cache is not None and cache_dir is not None:
+        with NEARBY_CACHE_LOCK:
+            disk_cache[key] = list(station_ids)
+            save_nearby_cache(cache_dir, disk_cache)
+    return station_ids
+
+
+# Column layout of bulk.meteostat.net/v2/daily/{id}.csv.gz (no header row).
+BULK_DAILY_COLUMNS = ("date", "tavg", "tmin", "tmax", "prcp", "snow", "wdir", "wspd", "wpgt", "pres", "tsun")
+BULK_DAILY_USECOLS = ("date", "tavg", "prcp", "wspd", "tsun")
+
+
+def fetch_bulk_daily_csv(station_id: str, start_date: date, end_date: date) -> Optional[pd.DataFrame]:
+    """Stream the bulk daily CSV directly, reading only the columns we aggregate.
+
+    Roughly halves parse time and memory vs. the library fetch, which decodes
+    every column with default dtypes. The bulk layout carries no rhum, so this
+    is only a fallback for when the meteostat client fails: station scoring and
+    the humidity_pct fill both depend on rhum, and a frame without it would
+    zero complete_months and leave humidity permanently unfilled. Returns None
+    on any failure.
+    """
+    url = f"https://bulk.meteostat.net/v2/daily/{station_id}.csv.gz"
+    try:
+        df = pd.read_csv(
+            url,
+            compression="gzip",
+            header=None,
+            names=BULK_DAILY_COLUMNS,
+            usecols=BULK_DAILY_USECOLS,
+            dtype={"tavg": "float32", "prcp": "float32", "wspd": "float32", "tsun": "float32"},
+            parse_dates=["date"],
+        )
+    except Exception:
+        return None
+    if df.empty:
+        return None
+    df = df.rename(columns={"tavg": "temp"}).set_index("date").sort_index()
+    return df.loc[pd.Timestamp(start_date) : pd.Timestamp(end_date)]
 
 
 def fetch_daily_dataframe(
@@ -157,15 +341,35 @@ def fetch_daily_dataframe(
     end_date: date,
     cache: Dict[str, Optional[pd.DataFrame]],
     sleep_ms: int,
+    cache_dir: Optional[Path] = None,
+    cache_ttl_days: int = 0,
 ) -> Optional[pd.DataFrame]:
-    if station_id in cache:
-        return cache[station_id]
+    with DAILY_CACHE_LOCK:
+        if station_id in cache:
+            return cache[station_id]
+
+    cache_file: Optional[Path] = None
+    if cache_dir is not None:
+        cache_file = cache_dir / f"{station_id}_{start_date.isoformat()}_{end_date.isoformat()}.parquet"
+        cached = read_daily_cache_file(cache_file, cache_ttl_days)
+        if cached is not None:
+            with DAILY_CACHE_LOCK:
+                cache[station_id] = cached
+            return cached
 
     try:
-        series = daily(station_id, start=start_date, end=end_date)
-        df = series.fetch()
+        # The client stays primary because it supplies rhum, which the bulk
+        # daily layout lacks; the trimmed bulk read is the degraded fallback.
+        try:
+            series = daily(station_id, start=start_date, end=end_date)
+            df = series.fetch()
+        except Exception:
+            df = None
         if df is None or df.empty:
-            cache[station_id] = None
+            df = fetch_bulk_daily_csv(station_id, start_date, end_date)
+        if df is None or df.empty:
+            with DAILY_CACHE_LOCK:
+                cache[station_id] = None
             return None
 
         if not isinstance(df.index, pd.DatetimeIndex):
@@ -176,10 +380,14 @@ def fetch_daily_dataframe(
             df.index = df.index.tz_convert("UTC").tz_localize(None)
 
         df = ensure_daily_columns(df).sort_index()
-        cache[station_id] = df
+        with DAILY_CACHE_LOCK:
+            cache[station_id] = df
+        if cache_file is not None:
+            write_daily_cache_file(cache_file, df)
         return df
     except Exception:
-        cache[station_id] = None
+        with DAILY_CACHE_LOCK:
+            cache[station_id] = None
         return None
     finally:
         if sleep_ms > 0:
@@ -196,14 +404,15 @@ def pick_best_station(
     min_days_per_month: int,
     cache: Dict[str, Optional[pd.DataFrame]],
     sleep_ms: int,
+    cache_dir: Optional[Path] = None,
+    cache_ttl_days: int = 0,
 ) -> Tuple[Optional[str], Optional[pd.DataFrame], Tuple[int, int]]:
     candidate_ids: list[str] = []
     if current_station_id:
         candidate_ids.append(current_station_id)
 
     try:
-        nearby = stations.nearby(Point(city_lat, city_lon)).head(max_candidates)
-        for station_id in nearby.index.tolist():
+        for station_id in nearby_station_ids(city_lat, city_lon, max_candidates, cache_dir):
             if station_id not in candidate_ids:
                 candidate_ids.append(station_id)
     except Exception:
@@ -214,8 +423,28 @@ def pick_best_station(
     best_df: Optional[pd.DataFrame] = None
     best_score = (-1, -1)
 
+    # Probe candidates concurrently (the inner per-request sleep is dropped:
+    # the worker pool already bounds how hard we hit Meteostat), then score
+    # in candidate order so tie-breaking stays deterministic.
+    if len(candidate_ids) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(candidate_ids), max_candidates)) as executor:
+            fetched = executor.map(
+                lambda station_id: fetch_daily_dataframe(
+                    station_id, start_date, end_date, cache, 0, cache_dir, cache_ttl_days
+                ),
+                candidate_ids,
+            )
+            frames = dict(zip(candidate_ids, fetched))
+    else:
+        frames = {
+            station_id: fetch_daily_dataframe(
+                station_id, start_date, end_date, cache, sleep_ms, cache_dir, cache_ttl_days
+            )
+            for station_id in candidate_ids
+        }
+
     for station_id in candidate_ids:
-        df = fetch_daily_dataframe(station_id, start_date, end_date, cache, sleep_ms)
+        df = frames.get(station_id)
         if df is None or df.empty:
             continue
         score = station_score(df, min_days_per_month)
@@ -248,13 +477,24 @@ def month_has_missing_core(raw: Dict[str, Any]) -> bool:
     return any(raw.get(key) is None for key in CORE_KEYS)
 
 
+def list_city_files(data_dir: Path) -> list[Path]:
+    """Single-pass directory scan; non-JSON names never become Path objects."""
+    names: list[str] = []
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                names.append(entry.name)
+    names.sort()
+    return [data_dir / name for name in names]
+
+
 def process_file(
     file_path: Path,
     options: CliOptions,
     fetched_at: str,
     daily_cache: Dict[str, Optional[pd.DataFrame]],
 ) -> Tuple[bool, int, bool, int]:
-    payload = json.loads(file_path.read_text(encoding="utf-8"))
+    payload = loads_json(file_path.read_bytes())
     city = payload.get("city", {})
     sources = payload.get("sources", {})
     climate_source = sources.get("climate", {})
@@ -265,7 +505,12 @@ def process_file(
     if not isinstance(lat, (float, int)) or not isinstance(lon, (float, int)):
         raise ValueError("city.lat/lon missing or invalid")
 
-    current_station = parse_station_id(str(climate_source.get("source_name", "")))
+    # Steady-state re-runs without overwrite: skip station probing entirely
+    # when every core field is populated and recently refreshed.
+    if not options.overwrite_climate and months_are_fresh(payload, fetched_at, options.freshness_days):
+        return False, 0, False, 0
+
+    current_station = parse_station_id(climate_source.get("source_name") or "")
     best_station, best_df, score = pick_best_station(
         city_lat=float(lat),
         city_lon=float(lon),
@@ -276,11 +521,15 @@ def process_file(
         min_days_per_month=options.min_days_per_month,
         cache=daily_cache,
         sleep_ms=options.sleep_ms,
+        cache_dir=options.cache_dir,
+        cache_ttl_days=options.cache_ttl_days,
     )
 
     if best_station is None or best_df is None:
         raise ValueError("no usable Meteostat station found")
 
+    months_values = aggregate_months(best_df)
+
     value_changes = 0
     missing_core_months = 0
     for month_row in months:
@@ -291,7 +540,7 @@ def process_file(
         if not isinstance(raw, dict):
             continue
 
-        month_values = aggregate_month(best_df, month)
+        month_values = months_values[month]
         value_changes += apply_climate_values(raw, month_values, options.overwrite_climate)
         month_row["climate_last_updated"] = fetched_at
 
@@ -311,7 +560,7 @@ def process_file(
     changed = value_changes > 0 or changed_station
 
     if changed and not options.dry_run:
-        file_path.write_text(f"{json.dumps(payload, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+        file_path.write_bytes(dumps_json_pretty(payload))
 
     # Return "completeness score" helper (months with enough data in station selection).
     complete_months = score[0]
@@ -329,7 +578,7 @@ def main(argv: list[str]) -> int:
         print(f"Data dir not found: {options.data_dir}", file=sys.stderr)
         return 2
 
-    files = sorted(options.data_dir.glob("*.json"))
+    files = list_city_files(options.data_dir)
     if not files:
         print(f"No JSON files found in {options.data_dir}", file=sys.stderr)
         return 2
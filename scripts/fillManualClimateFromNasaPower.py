@@ -3,7 +3,12 @@ from __future__ import annotations
 
 import argparse
 import calendar
+import functools
+import gzip
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -11,9 +16,20 @@ from typing import Any, Dict, Optional
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
+try:
+    import numpy as np  # optional: vectorizes the per-month value table
+except ImportError:
+    np = None
+
+try:
+    import orjson  # optional: ~5-10x faster JSON encode/decode
+except ImportError:
+    orjson = None
+
 NASA_BASE_URL = "https://power.larc.nasa.gov/api/temporal/climatology/point"
 NASA_PARAMS = "T2M,T2M_MAX,T2M_MIN,PRECTOTCORR,RH2M,WS2M"
 NASA_MONTH_KEYS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+NASA_FILL_FIELDS = ("temp_min_c", "temp_avg_c", "temp_max_c", "rain_mm", "humidity_pct", "wind_avg_kph")
 
 
 @dataclass
@@ -21,6 +37,10 @@ class CliOptions:
     data_dir: Path
     dry_run: bool
     region_ids: list[str]
+    concurrency: int
+    workers: int
+    cache_dir: Optional[Path]
+    cache_ttl_days: int
 
 
 def parse_args() -> CliOptions:
@@ -33,9 +53,21 @@ def parse_args() -> CliOptions:
     parser.add_argument("--dir", default="data/manual-city-month")
     parser.add_argument("--dryRun", action="store_true")
     parser.add_argument("--regionIds", default="")
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--cacheDir", default=".cache/nasa-power")
+    parser.add_argument("--cacheTtlDays", type=int, default=30)
     args = parser.parse_args()
     region_ids = [item.strip() for item in str(args.regionIds).split(",") if item.strip()]
-    return CliOptions(data_dir=Path(args.dir).resolve(), dry_run=bool(args.dryRun), region_ids=region_ids)
+    return CliOptions(
+        data_dir=Path(args.dir).resolve(),
+        dry_run=bool(args.dryRun),
+        region_ids=region_ids,
+        concurrency=max(1, int(args.concurrency)),
+        workers=max(1, int(args.workers)),
+        cache_dir=Path(args.cacheDir).resolve() if str(args.cacheDir).strip() else None,
+        cache_ttl_days=max(0, int(args.cacheTtlDays)),
+    )
 
 
 def to_float_or_none(value: Any) -> Optional[float]:
@@ -69,15 +101,75 @@ def build_nasa_url(lat: float, lon: float) -> str:
     return f"{NASA_BASE_URL}?{query}"
 
 
-def fetch_nasa_climatology(lat: float, lon: float) -> Dict[str, Dict[str, Any]]:
+def read_cached_response(cache_file: Path, ttl_days: int) -> Optional[bytes]:
+    try:
+        if not cache_file.exists():
+            return None
+        if time.time() - cache_file.stat().st_mtime > ttl_days * 86400:
+            return None
+        return gzip.decompress(cache_file.read_bytes())
+    except Exception:
+        return None  # unreadable entries count as misses
+
+
+def write_cached_response(cache_file: Path, raw: bytes) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(cache_file.suffix + ".tmp")
+        tmp_file.write_bytes(gzip.compress(raw))
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        pass  # best-effort; a failed cache write must not fail the fill
+
+
+def fetch_nasa_climatology(
+    lat: float, lon: float, cache_dir: Optional[Path] = None, cache_ttl_days: int = 0
+) -> Dict[str, Dict[str, Any]]:
     url = build_nasa_url(lat, lon)
+    # Climatology is a long-term mean, so re-runs can serve it from disk.
+    cache_file = cache_dir / f"{lat:.4f}_{lon:.4f}.json.gz" if cache_dir is not None else None
+    if cache_file is not None:
+        raw = read_cached_response(cache_file, cache_ttl_days)
+        if raw is not None:
+            return loads_json(raw)["properties"]["parameter"]
     with urlopen(url, timeout=30) as response:
-        payload = json.loads(response.read().decode("utf-8"))
+        raw = response.read()
+    payload = loads_json(raw)
+    if cache_file is not None:
+        write_cached_response(cache_file, raw)
     return payload["properties"]["parameter"]
 
 
-def month_key(month: int) -> str:
-    return NASA_MONTH_KEYS[month - 1]
+def loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json_pretty(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return f"{json.dumps(payload, indent=2, ensure_ascii=True)}\n".encode("utf-8")
+
+
+def atomic_write_json(file_path: Path, payload: Any) -> bool:
+    """Write the payload atomically, skipping the write when bytes match.
+
+    Serializing up front lets a re-run that recomputes identical content
+    leave the file (and its mtime) untouched; real changes go through a
+    sibling tmp file and os.replace so a crash mid-write cannot truncate
+    the city file.
+    """
+    new_bytes = dumps_json_pretty(payload)
+    try:
+        if file_path.read_bytes() == new_bytes:
+            return False
+    except OSError:
+        pass  # unreadable/missing current file: just write
+    tmp_file = file_path.with_suffix(file_path.suffix + ".tmp")
+    tmp_file.write_bytes(new_bytes)
+    os.replace(tmp_file, file_path)
+    return True
 
 
 def append_source(existing: str, addition: str) -> str:
@@ -89,8 +181,102 @@ def append_source(existing: str, addition: str) -> str:
     return f"{existing_trim} | {addition}"
 
 
-def fill_file(file_path: Path, fetched_at: str) -> Dict[str, int]:
-    payload = json.loads(file_path.read_text(encoding="utf-8"))
+# Row order of the parameter table used by the NumPy path.
+NASA_PARAM_ORDER = ("T2M_MIN", "T2M", "T2M_MAX", "PRECTOTCORR", "RH2M", "WS2M")
+
+
+def nan_or_float(value: Any) -> float:
+    coerced = to_float_or_none(value)
+    return np.nan if coerced is None else coerced
+
+
+@functools.lru_cache(maxsize=None)
+def days_per_month(year: int) -> tuple:
+    """Month lengths for a year, cached since most files share the same year."""
+    return tuple(calendar.monthrange(year, month)[1] for month in range(1, 13))
+
+
+def monthly_target_values_numpy(params: Dict[str, Dict[str, Any]], year: int) -> list:
+    """Per-month fill values (index 1..12), computed from a (6, 12) SoA table.
+
+    The derived rain/wind series are vectorized; final rounding goes through
+    round_or_none on plain floats so the output matches the scalar path.
+    """
+    # Odd cells (e.g. numeric strings) go through to_float_or_none so the
+    # table drops exactly what the scalar path drops.
+    table = np.array(
+        [
+            [
+                value
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                else nan_or_float(value)
+                for value in (params.get(name, {}).get(key) for key in NASA_MONTH_KEYS)
+            ]
+            for name in NASA_PARAM_ORDER
+        ],
+        dtype=np.float64,
+    )
+    table[table <= -900] = np.nan
+    days = np.array(days_per_month(year), dtype=np.float64)
+    rain = table[3] * days
+    wind = table[5] * 3.6
+
+    def as_value(raw: "np.floating") -> Optional[float]:
+        return None if np.isnan(raw) else round_or_none(float(raw))
+
+    values: list = [None]
+    for index in range(12):
+        values.append(
+            {
+                "temp_min_c": as_value(table[0, index]),
+                "temp_avg_c": as_value(table[1, index]),
+                "temp_max_c": as_value(table[2, index]),
+                "rain_mm": as_value(rain[index]),
+                "humidity_pct": as_value(table[4, index]),
+                "wind_avg_kph": as_value(wind[index]),
+            }
+        )
+    return values
+
+
+def monthly_target_values_scalar(params: Dict[str, Dict[str, Any]], year: int) -> list:
+    # Coerce every series to floats up front, one tuple per month, so the
+    # loop below never re-hashes month or parameter names.
+    by_month = [
+        tuple(to_float_or_none(params.get(name, {}).get(key)) for name in NASA_PARAM_ORDER)
+        for key in NASA_MONTH_KEYS
+    ]
+
+    month_days = days_per_month(year)
+    values: list = [None]
+    for month in range(1, 13):
+        temp_min, temp_avg, temp_max, precip, humidity, wind = by_month[month - 1]
+        values.append(
+            {
+                "temp_min_c": round_or_none(temp_min),
+                "temp_avg_c": round_or_none(temp_avg),
+                "temp_max_c": round_or_none(temp_max),
+                "rain_mm": round_or_none(precip * month_days[month - 1]) if precip is not None else None,
+                "humidity_pct": round_or_none(humidity),
+                "wind_avg_kph": round_or_none(wind * 3.6) if wind is not None else None,
+            }
+        )
+    return values
+
+
+def monthly_target_values(params: Dict[str, Dict[str, Any]], year: int) -> list:
+    if np is not None:
+        return monthly_target_values_numpy(params, year)
+    return monthly_target_values_scalar(params, year)
+
+
+def fill_file(
+    file_path: Path,
+    fetched_at: str,
+    cache_dir: Optional[Path] = None,
+    cache_ttl_days: int = 0,
+) -> Dict[str, int]:
+    payload = loads_json(file_path.read_bytes())
     city = payload.get("city", {})
     lat = city.get("lat")
     lon = city.get("lon")
@@ -99,36 +285,30 @@ def fill_file(file_path: Path, fetched_at: str) -> Dict[str, int]:
     if not isinstance(lat, (float, int)) or not isinstance(lon, (float, int)):
         raise ValueError("city.lat/lon missing")
 
-    params = fetch_nasa_climatology(float(lat), float(lon))
-
     months = payload.get("months", [])
     changed_fields = 0
     changed_months = 0
 
+    # This script only ever fills null fields, so when nothing is null there
+    # is nothing to fetch either.
+    if not any(
+        month_row.get("raw", {}).get(field) is None
+        for month_row in months
+        if isinstance(month_row.get("raw"), dict)
+        for field in NASA_FILL_FIELDS
+    ):
+        return {"changed_fields": 0, "changed_months": 0, "payload": payload}
+
+    params = fetch_nasa_climatology(float(lat), float(lon), cache_dir=cache_dir, cache_ttl_days=cache_ttl_days)
+    targets = monthly_target_values(params, year)
+
     for month_row in months:
         month = month_row.get("month")
         raw = month_row.get("raw")
         if not isinstance(month, int) or month < 1 or month > 12 or not isinstance(raw, dict):
             continue
 
-        key = month_key(month)
-        days_in_month = calendar.monthrange(year, month)[1]
-        target_values = {
-            "temp_min_c": round_or_none(to_float_or_none(params.get("T2M_MIN", {}).get(key))),
-            "temp_avg_c": round_or_none(to_float_or_none(params.get("T2M", {}).get(key))),
-            "temp_max_c": round_or_none(to_float_or_none(params.get("T2M_MAX", {}).get(key))),
-            "rain_mm": round_or_none(
-                (to_float_or_none(params.get("PRECTOTCORR", {}).get(key)) or 0.0) * days_in_month
-                if to_float_or_none(params.get("PRECTOTCORR", {}).get(key)) is not None
-                else None
-            ),
-            "humidity_pct": round_or_none(to_float_or_none(params.get("RH2M", {}).get(key))),
-            "wind_avg_kph": round_or_none(
-                (to_float_or_none(params.get("WS2M", {}).get(key)) or 0.0) * 3.6
-                if to_float_or_none(params.get("WS2M", {}).get(key)) is not None
-                else None
-            ),
-        }
+        target_values = targets[month]
 
         row_changed = False
         for field, value in target_values.items():
@@ -159,6 +339,25 @@ def fill_file(file_path: Path, fetched_at: str) -> Dict[str, int]:
     }
 
 
+def process_file_worker(args: tuple) -> tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Top-level worker for --workers > 1; must stay picklable.
+
+    Exceptions are flattened to strings because some (e.g. HTTPError) do not
+    survive the trip back through the process pool.
+    """
+    file_path, options, fetched_at = args
+    try:
+        result = fill_file(
+            file_path,
+            fetched_at=fetched_at,
+            cache_dir=options.cache_dir,
+            cache_ttl_days=options.cache_ttl_days,
+        )
+        return result, None
+    except Exception as error:
+        return None, str(error)
+
+
 def main() -> int:
     options = parse_args()
     if not options.data_dir.exists():
@@ -176,11 +375,43 @@ def main() -> int:
     changed_months = 0
     errors = 0
 
-    print(f"Starting NASA fallback fill: files={len(files)}, dryRun={options.dry_run}")
+    print(
+        f"Starting NASA fallback fill: files={len(files)}, dryRun={options.dry_run}, "
+        f"concurrency={options.concurrency}, workers={options.workers}"
+    )
 
-    for index, file_path in enumerate(files, start=1):
+    def run_one(file_path: Path) -> tuple[Optional[Dict[str, Any]], Optional[Exception]]:
         try:
-            result = fill_file(file_path, fetched_at=fetched_at)
+            return (
+                fill_file(
+                    file_path,
+                    fetched_at=fetched_at,
+                    cache_dir=options.cache_dir,
+                    cache_ttl_days=options.cache_ttl_days,
+                ),
+                None,
+            )
+        except Exception as error:
+            return None, error
+
+    # The per-file work is dominated by the NASA round trip, so overlap the
+    # fetches on a thread pool; with --workers > 1 the JSON parse/serialize
+    # CPU work additionally spreads across processes (useful once responses
+    # come from the on-disk cache). map() yields in submit order either way,
+    # which keeps the progress log and all file writes on the main thread.
+    if options.workers > 1:
+        executor = ProcessPoolExecutor(max_workers=options.workers)
+        tasks = [(file_path, options, fetched_at) for file_path in files]
+        outcomes = executor.map(process_file_worker, tasks, chunksize=4)
+    else:
+        executor = ThreadPoolExecutor(max_workers=options.concurrency)
+        outcomes = executor.map(run_one, files)
+    with executor:
+        for index, (file_path, (result, error)) in enumerate(zip(files, outcomes), start=1):
+            if error is not None:
+                errors += 1
+                print(f"[{index}/{len(files)}] {file_path.name} -> ERROR: {error}")
+                continue
             processed += 1
             changed_fields += result["changed_fields"]
             changed_months += result["changed_months"]
@@ -188,16 +419,13 @@ def main() -> int:
             if result["changed_fields"] > 0:
                 changed_files += 1
                 if not options.dry_run:
-                    file_path.write_text(f"{json.dumps(result['payload'], indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+                    atomic_write_json(file_path, result["payload"])
 
             print(
                 f"[{index}/{len(files)}] {file_path.name} -> "
                 f"{'updated' if result['changed_fields'] > 0 else 'unchanged'} "
                 f"(fields={result['changed_fields']}, months={result['changed_months']})"
             )
-        except Exception as error:
-            errors += 1
-            print(f"[{index}/{len(files)}] {file_path.name} -> ERROR: {error}")
 
     print("NASA fallback summary:")
     print(f"- processed: {processed}")
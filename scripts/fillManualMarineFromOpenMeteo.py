@@ -2,9 +2,15 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import gzip
 import json
 import math
+import os
+import threading
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -13,9 +19,29 @@ from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
+try:
+    import numpy as np  # optional: vectorizes the hourly aggregation
+except ImportError:
+    np = None
+
+try:
+    import orjson  # optional: ~5-10x faster JSON encode/decode
+except ImportError:
+    orjson = None
+
 MARINE_BASE_URL = "https://marine-api.open-meteo.com/v1/marine"
 HOURLY_FIELDS = "wave_height,wave_period,sea_surface_temperature"
 MONTHS = tuple(range(1, 13))
+# A full-year hourly response is ~1-2 MB; anything past this is not a payload
+# we want to buffer, especially multiplied across the offset-probe candidates.
+MAX_MARINE_BYTES = 8 * 1024 * 1024
+MARINE_FIELDS = (
+    "wave_height_min_m",
+    "wave_height_avg_m",
+    "wave_height_max_m",
+    "wave_interval_avg_s",
+    "water_temp_c",
+)
 
 WAVE_MIN_M = 0.0
 WAVE_MAX_M = 30.0
@@ -32,11 +58,17 @@ class CliOptions:
     region_ids: list[str]
     overwrite: bool
     pause_ms: int
+    rate_per_sec: float
     attempts: int
+    concurrency: int
+    probe_concurrency: int
+    workers: int
     include_inland: bool
     max_offset_deg: float
     offset_step_deg: float
     max_candidates: int
+    cache_dir: Optional[Path]
+    cache_ttl_days: int
 
 
 def parse_args() -> CliOptions:
@@ -50,26 +82,45 @@ def parse_args() -> CliOptions:
     parser.add_argument("--regionIds", default="")
     parser.add_argument("--dryRun", action="store_true")
     parser.add_argument("--overwrite", action="store_true")
+    # --pauseMs is kept for compatibility; when --ratePerSec is unset the
+    # effective rate is derived from it (900ms pause ~= 1.1 req/s).
     parser.add_argument("--pauseMs", type=int, default=900)
+    parser.add_argument("--ratePerSec", type=float, default=0.0, help="global request rate; 0 derives it from --pauseMs")
     parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--probeConcurrency", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1)
     parser.add_argument("--includeInland", action="store_true")
     parser.add_argument("--maxOffsetDeg", type=float, default=1.2)
     parser.add_argument("--offsetStepDeg", type=float, default=0.2)
     parser.add_argument("--maxCandidates", type=int, default=36)
+    parser.add_argument("--cacheDir", default=".cache/openmeteo-marine")
+    # Past-year hourly marine data is immutable, so the cache can live long.
+    parser.add_argument("--cacheTtlDays", type=int, default=365)
     args = parser.parse_args()
 
     region_ids = [item.strip() for item in str(args.regionIds).split(",") if item.strip()]
+    pause_ms = max(0, int(args.pauseMs))
+    rate_per_sec = float(args.ratePerSec)
+    if rate_per_sec <= 0:
+        rate_per_sec = 1000.0 / pause_ms if pause_ms > 0 else 0.0
     return CliOptions(
         data_dir=Path(args.dir).resolve(),
         dry_run=bool(args.dryRun),
         region_ids=region_ids,
         overwrite=bool(args.overwrite),
-        pause_ms=max(0, int(args.pauseMs)),
+        pause_ms=pause_ms,
+        rate_per_sec=rate_per_sec,
         attempts=max(1, int(args.attempts)),
+        concurrency=max(1, int(args.concurrency)),
+        probe_concurrency=max(1, int(args.probeConcurrency)),
+        workers=max(1, int(args.workers)),
         include_inland=bool(args.includeInland),
         max_offset_deg=max(0.2, float(args.maxOffsetDeg)),
         offset_step_deg=max(0.1, float(args.offsetStepDeg)),
         max_candidates=max(8, int(args.maxCandidates)),
+        cache_dir=Path(args.cacheDir).resolve() if str(args.cacheDir).strip() else None,
+        cache_ttl_days=max(0, int(args.cacheTtlDays)),
     )
 
 
@@ -111,6 +162,36 @@ def build_marine_url(lat: float, lon: float, year: int) -> str:
     return f"{MARINE_BASE_URL}?{query}"
 
 
+class TokenBucket:
+    """Caps outgoing requests to a sustained rate across worker threads.
+
+    Unlike fixed interval spacing, a token bucket lets a short burst (up to
+    `burst` requests) go out immediately after idle periods while still
+    holding the long-run rate at rate_per_sec; rate <= 0 means unlimited.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1) -> None:
+        self._rate = max(0.0, rate_per_sec)
+        self._capacity = max(1, burst)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self._rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                delay = (1.0 - self._tokens) / self._rate
+            time.sleep(delay)
+
+
 def to_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -125,12 +206,62 @@ def to_float(value: Any) -> Optional[float]:
     return as_float
 
 
-def fetch_hourly_marine(url: str, attempts: int) -> Dict[str, Any]:
+def read_cached_response(cache_file: Path, ttl_days: int) -> Optional[bytes]:
+    try:
+        if not cache_file.exists():
+            return None
+        if time.time() - cache_file.stat().st_mtime > ttl_days * 86400:
+            return None
+        return gzip.decompress(cache_file.read_bytes())
+    except Exception:
+        return None  # unreadable entries count as misses
+
+
+def write_cached_response(cache_file: Path, raw: bytes) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(cache_file.suffix + ".tmp")
+        tmp_file.write_bytes(gzip.compress(raw))
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        pass  # best-effort; a failed cache write must not fail the fill
+
+
+def marine_cache_file(cache_dir: Optional[Path], lat: float, lon: float, year: int) -> Optional[Path]:
+    if cache_dir is None:
+        return None
+    return cache_dir / f"{lat:.4f}_{lon:.4f}_{year}.json.gz"
+
+
+def fetch_hourly_marine(
+    url: str,
+    attempts: int,
+    limiter: Optional[TokenBucket] = None,
+    cache_file: Optional[Path] = None,
+    cache_ttl_days: int = 0,
+) -> Dict[str, Any]:
+    # Every offset probe re-downloads a multi-MB hourly payload, so serving
+    # repeats from disk matters far more here than for the single-point APIs.
+    if cache_file is not None:
+        raw = read_cached_response(cache_file, cache_ttl_days)
+        if raw is not None:
+            return loads_json(raw)
+
     last_error: Optional[Exception] = None
     for attempt in range(1, attempts + 1):
         try:
+            if limiter is not None:
+                limiter.acquire()
             with urlopen(url, timeout=45) as response:
-                return json.loads(response.read().decode("utf-8"))
+                content_length = response.headers.get("Content-Length")
+                if content_length and content_length.isdigit() and int(content_length) > MAX_MARINE_BYTES:
+                    raise RuntimeError(f"Marine payload too large ({content_length} bytes): {url}")
+                raw = response.read(MAX_MARINE_BYTES + 1)
+                if len(raw) > MAX_MARINE_BYTES:
+                    raise RuntimeError(f"Marine payload too large (>{MAX_MARINE_BYTES} bytes): {url}")
+            if cache_file is not None:
+                write_cached_response(cache_file, raw)
+            return loads_json(raw)
         except HTTPError as error:
             last_error = error
             if error.code != 429 or attempt >= attempts:
@@ -148,38 +279,100 @@ def fetch_hourly_marine(url: str, attempts: int) -> Dict[str, Any]:
     raise last_error
 
 
-def value_at(values: Any, index: int) -> Any:
-    if not isinstance(values, list):
-        return None
-    if index < 0 or index >= len(values):
-        return None
-    return values[index]
+# Per-month (height_min, height_avg, height_max, period_avg, temp_avg) before rounding/clamping.
+MonthStats = Dict[int, tuple[Optional[float], Optional[float], Optional[float], Optional[float], Optional[float]]]
 
 
-def monthly_marine_aggregate(payload: Dict[str, Any]) -> Dict[int, Dict[str, Optional[float]]]:
-    hourly = payload.get("hourly", {})
-    times = hourly.get("time", [])
-    wave_heights = hourly.get("wave_height", [])
-    wave_periods = hourly.get("wave_period", [])
-    water_temps = hourly.get("sea_surface_temperature", [])
+def nan_or_float(value: Any) -> float:
+    # Slow path for odd samples (e.g. numeric strings): defer to to_float so
+    # the NumPy path counts exactly what the scalar fallback counts.
+    coerced = to_float(value)
+    return np.nan if coerced is None else coerced
 
-    month_wave_height: Dict[int, list[float]] = {month: [] for month in MONTHS}
-    month_wave_period: Dict[int, list[float]] = {month: [] for month in MONTHS}
-    month_water_temp: Dict[int, list[float]] = {month: [] for month in MONTHS}
 
-    if not isinstance(times, list):
-        times = []
+def as_float_array(values: Any, length: int) -> "np.ndarray":
+    arr = np.array(
+        [
+            value if isinstance(value, (int, float)) and not isinstance(value, bool) else nan_or_float(value)
+            for value in values[:length]
+        ],
+        dtype=np.float64,
+    )
+    arr[arr <= -900] = np.nan
+    return arr
+
+
+def nan_monthly_means(month_idx: "np.ndarray", arr: "np.ndarray") -> "np.ndarray":
+    mask = ~np.isnan(arr)
+    sums = np.bincount(month_idx[mask], weights=arr[mask], minlength=12)
+    counts = np.bincount(month_idx[mask], minlength=12)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def monthly_marine_stats_numpy(times: list, wave_heights: list, wave_periods: list, water_temps: list, length: int) -> MonthStats:
+    ts = np.asarray(times[:length], dtype="U16")
+    chars = ts.view("U1").view(np.uint32).reshape(length, -1)
+    month_tens = chars[:, 5] - 48
+    month_ones = chars[:, 6] - 48
+    months = month_tens * 10 + month_ones
+    valid = (month_tens <= 9) & (month_ones <= 9) & (months >= 1) & (months <= 12)
+    month_idx = np.where(valid, months - 1, 0).astype(np.intp)
+
+    height = as_float_array(wave_heights, length)
+    period = as_float_array(wave_periods, length)
+    temp = as_float_array(water_temps, length)
+    for arr in (height, period, temp):
+        arr[~valid] = np.nan
+
+    height_means = nan_monthly_means(month_idx, height)
+    period_means = nan_monthly_means(month_idx, period)
+    temp_means = nan_monthly_means(month_idx, temp)
+
+    height_min = np.full(12, np.inf)
+    height_max = np.full(12, -np.inf)
+    height_mask = ~np.isnan(height)
+    np.minimum.at(height_min, month_idx[height_mask], height[height_mask])
+    np.maximum.at(height_max, month_idx[height_mask], height[height_mask])
+
+    stats: MonthStats = {}
+    for month in MONTHS:
+        i = month - 1
+        # Plain floats so round() behaves identically to the scalar path.
+        stats[month] = (
+            float(height_min[i]) if np.isfinite(height_min[i]) else None,
+            float(height_means[i]) if not np.isnan(height_means[i]) else None,
+            float(height_max[i]) if np.isfinite(height_max[i]) else None,
+            float(period_means[i]) if not np.isnan(period_means[i]) else None,
+            float(temp_means[i]) if not np.isnan(temp_means[i]) else None,
+        )
+    return stats
 
-    for index, timestamp in enumerate(times):
+
+def monthly_marine_stats_scalar(times: list, wave_heights: list, wave_periods: list, water_temps: list, length: int) -> MonthStats:
+    # Unboxed doubles: 8 bytes per sample instead of a PyFloat each, and
+    # sum/min/max over them run as C-level scans.
+    month_wave_height: Dict[int, array] = {month: array("d") for month in MONTHS}
+    month_wave_period: Dict[int, array] = {month: array("d") for month in MONTHS}
+    month_water_temp: Dict[int, array] = {month: array("d") for month in MONTHS}
+
+    for index in range(length):
+        timestamp = times[index]
         if not isinstance(timestamp, str) or len(timestamp) < 10:
             continue
-        month = int(timestamp[5:7])
-        if month not in month_wave_height:
+        # ISO-8601 puts the month at two fixed ASCII digits; codepoint
+        # arithmetic skips the substring slice and int() parse per sample,
+        # and quietly rejects non-digit characters like the NumPy path.
+        month_tens = ord(timestamp[5]) - 48
+        month_ones = ord(timestamp[6]) - 48
+        month = month_tens * 10 + month_ones
+        if not (0 <= month_tens <= 9 and 0 <= month_ones <= 9 and 1 <= month <= 12):
             continue
 
-        wave_height = to_float(value_at(wave_heights, index))
-        wave_period = to_float(value_at(wave_periods, index))
-        water_temp = to_float(value_at(water_temps, index))
+        # The dispatcher pads every series to the timestamp length, so plain
+        # subscripts are safe here and skip a helper call per sample.
+        wave_height = to_float(wave_heights[index])
+        wave_period = to_float(wave_periods[index])
+        water_temp = to_float(water_temps[index])
 
         if wave_height is not None:
             month_wave_height[month].append(wave_height)
@@ -188,17 +381,58 @@ def monthly_marine_aggregate(payload: Dict[str, Any]) -> Dict[int, Dict[str, Opt
         if water_temp is not None:
             month_water_temp[month].append(water_temp)
 
-    result: Dict[int, Dict[str, Optional[float]]] = {}
+    stats: MonthStats = {}
     for month in MONTHS:
         heights = month_wave_height[month]
         periods = month_wave_period[month]
         water_temps_month = month_water_temp[month]
+        stats[month] = (
+            min(heights) if heights else None,
+            sum(heights) / len(heights) if heights else None,
+            max(heights) if heights else None,
+            sum(periods) / len(periods) if periods else None,
+            sum(water_temps_month) / len(water_temps_month) if water_temps_month else None,
+        )
+    return stats
+
 
-        wave_height_min = round_or_none(min(heights)) if heights else None
-        wave_height_avg = round_or_none(sum(heights) / len(heights)) if heights else None
-        wave_height_max = round_or_none(max(heights)) if heights else None
-        wave_period_avg = round_or_none(sum(periods) / len(periods)) if periods else None
-        water_temp_avg = round_or_none(sum(water_temps_month) / len(water_temps_month)) if water_temps_month else None
+def monthly_marine_aggregate(payload: Dict[str, Any]) -> Dict[int, Dict[str, Optional[float]]]:
+    hourly = payload.get("hourly", {})
+    times = hourly.get("time", [])
+    wave_heights = hourly.get("wave_height", [])
+    wave_periods = hourly.get("wave_period", [])
+    water_temps = hourly.get("sea_surface_temperature", [])
+
+    if not isinstance(times, list):
+        times = []
+    length = len(times)
+
+    def padded(values: Any) -> list:
+        # Ragged or missing series behave like the old per-index lookup:
+        # anything beyond the series end reads as None.
+        if not isinstance(values, list):
+            return [None] * length
+        if len(values) < length:
+            return values + [None] * (length - len(values))
+        return values
+
+    wave_heights = padded(wave_heights)
+    wave_periods = padded(wave_periods)
+    water_temps = padded(water_temps)
+    if np is not None and length > 0:
+        stats = monthly_marine_stats_numpy(times, wave_heights, wave_periods, water_temps, length)
+    else:
+        stats = monthly_marine_stats_scalar(times, wave_heights, wave_periods, water_temps, length)
+
+    result: Dict[int, Dict[str, Optional[float]]] = {}
+    for month in MONTHS:
+        height_min_raw, height_avg_raw, height_max_raw, period_avg_raw, temp_avg_raw = stats[month]
+
+        wave_height_min = round_or_none(height_min_raw)
+        wave_height_avg = round_or_none(height_avg_raw)
+        wave_height_max = round_or_none(height_max_raw)
+        wave_period_avg = round_or_none(period_avg_raw)
+        water_temp_avg = round_or_none(temp_avg_raw)
 
         result[month] = {
             "wave_height_min_m": clamp_or_none(wave_height_min, WAVE_MIN_M, WAVE_MAX_M),
@@ -237,7 +471,10 @@ def marine_coverage(by_month: Dict[int, Dict[str, Optional[float]]]) -> Dict[str
     }
 
 
-def build_offset_candidates(max_offset_deg: float, offset_step_deg: float, max_candidates: int) -> list[tuple[float, float]]:
+@functools.lru_cache(maxsize=8)
+def build_offset_candidates(max_offset_deg: float, offset_step_deg: float, max_candidates: int) -> tuple[tuple[float, float], ...]:
+    # The arguments are CLI flags, so every file asks for the same grid;
+    # build and sort it once. A tuple keeps the cached value immutable.
     rings = max(1, int(round(max_offset_deg / offset_step_deg)))
     candidates: list[tuple[float, float]] = [(0.0, 0.0)]
     seen = {(0.0, 0.0)}
@@ -260,8 +497,7 @@ def build_offset_candidates(max_offset_deg: float, offset_step_deg: float, max_c
         key=lambda item: (item[0] * item[0] + item[1] * item[1], abs(item[0]) + abs(item[1])),
     )
 
-    capped = sorted_candidates[: max(2, max_candidates)]
-    return capped
+    return tuple(sorted_candidates[: max(2, max_candidates)])
 
 
 def distance_km(lat: float, dx: float, dy: float) -> float:
@@ -270,6 +506,38 @@ def distance_km(lat: float, dx: float, dy: float) -> float:
     return math.sqrt(lat_km * lat_km + lon_km * lon_km)
 
 
+def loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json_pretty(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return f"{json.dumps(payload, indent=2, ensure_ascii=True)}\n".encode("utf-8")
+
+
+def atomic_write_json(file_path: Path, payload: Any) -> bool:
+    """Write the payload atomically, skipping the write when bytes match.
+
+    Serializing up front lets a re-run that recomputes identical content
+    leave the file (and its mtime) untouched; real changes go through a
+    sibling tmp file and os.replace so a crash mid-write cannot truncate
+    the city file.
+    """
+    new_bytes = dumps_json_pretty(payload)
+    try:
+        if file_path.read_bytes() == new_bytes:
+            return False
+    except OSError:
+        pass  # unreadable/missing current file: just write
+    tmp_file = file_path.with_suffix(file_path.suffix + ".tmp")
+    tmp_file.write_bytes(new_bytes)
+    os.replace(tmp_file, file_path)
+    return True
+
+
 def append_source(existing: str, addition: str) -> str:
     current = (existing or "").strip()
     if not current:
@@ -279,8 +547,8 @@ def append_source(existing: str, addition: str) -> str:
     return f"{current} | {addition}"
 
 
-def fill_file(file_path: Path, options: CliOptions, fetched_at: str) -> Dict[str, Any]:
-    payload = json.loads(file_path.read_text(encoding="utf-8"))
+def fill_file(file_path: Path, options: CliOptions, fetched_at: str, limiter: Optional[TokenBucket] = None) -> Dict[str, Any]:
+    payload = loads_json(file_path.read_bytes())
     city = payload.get("city", {})
     lat = city.get("lat")
     lon = city.get("lon")
@@ -292,16 +560,39 @@ def fill_file(file_path: Path, options: CliOptions, fetched_at: str) -> Dict[str
             "changed_fields": 0,
             "changed_months": 0,
             "skipped": True,
+            "skip_reason": "inland",
             "payload": payload,
         }
 
     if not isinstance(lat, (float, int)) or not isinstance(lon, (float, int)):
         raise ValueError("city.lat/lon missing")
 
+    # Re-runs over a populated dataset: if no month is missing any marine
+    # field (and we are not overwriting), there is nothing to fetch.
+    if not options.overwrite and not any(
+        month_row.get("raw", {}).get(field) is None
+        for month_row in payload.get("months", [])
+        if isinstance(month_row.get("raw"), dict)
+        for field in MARINE_FIELDS
+    ):
+        return {
+            "changed_fields": 0,
+            "changed_months": 0,
+            "skipped": True,
+            "skip_reason": "complete",
+            "payload": payload,
+        }
+
     origin_lat = float(lat)
     origin_lon = float(lon)
     url = build_marine_url(origin_lat, origin_lon, year)
-    data = fetch_hourly_marine(url, attempts=options.attempts)
+    data = fetch_hourly_marine(
+        url,
+        attempts=options.attempts,
+        limiter=limiter,
+        cache_file=marine_cache_file(options.cache_dir, origin_lat, origin_lon, year),
+        cache_ttl_days=options.cache_ttl_days,
+    )
     by_month = monthly_marine_aggregate(data)
     best_url = url
     best_lat = origin_lat
@@ -316,24 +607,49 @@ def fill_file(file_path: Path, options: CliOptions, fetched_at: str) -> Dict[str
             offset_step_deg=options.offset_step_deg,
             max_candidates=options.max_candidates,
         )
-        for dx, dy in offsets[1:]:
+        probe = offsets[1:]
+
+        def fetch_candidate(offset: tuple[float, float]) -> tuple[float, float, str, Dict[int, Dict[str, Optional[float]]]]:
+            dx, dy = offset
             candidate_lat = round(origin_lat + dy, 6)
             candidate_lon = round(origin_lon + dx, 6)
             candidate_url = build_marine_url(candidate_lat, candidate_lon, year)
-            candidate_data = fetch_hourly_marine(candidate_url, attempts=options.attempts)
-            candidate_months = monthly_marine_aggregate(candidate_data)
-            candidate_cov = marine_coverage(candidate_months)
-
-            if candidate_cov["score"] > best_cov["score"]:
-                by_month = candidate_months
-                best_cov = candidate_cov
-                best_url = candidate_url
-                best_lat = candidate_lat
-                best_lon = candidate_lon
-                best_dx = dx
-                best_dy = dy
-
-            if best_cov["wave_months"] == 12 and best_cov["water_months"] == 12:
+            candidate_data = fetch_hourly_marine(
+                candidate_url,
+                attempts=options.attempts,
+                limiter=limiter,
+                cache_file=marine_cache_file(options.cache_dir, candidate_lat, candidate_lon, year),
+                cache_ttl_days=options.cache_ttl_days,
+            )
+            return candidate_lat, candidate_lon, candidate_url, monthly_marine_aggregate(candidate_data)
+
+        # Fetch candidates in small concurrent batches so the long tail of
+        # stubborn coastal cities is not N serial round trips. Results are
+        # still evaluated in distance order, so the selected fallback (and
+        # any fetch error) matches what the serial loop would have produced.
+        batch_size = min(options.probe_concurrency, len(probe))
+        done = False
+        for start in range(0, len(probe), batch_size):
+            chunk = probe[start : start + batch_size]
+            with ThreadPoolExecutor(max_workers=len(chunk)) as probe_executor:
+                futures = [probe_executor.submit(fetch_candidate, offset) for offset in chunk]
+                for (dx, dy), future in zip(chunk, futures):
+                    candidate_lat, candidate_lon, candidate_url, candidate_months = future.result()
+                    candidate_cov = marine_coverage(candidate_months)
+
+                    if candidate_cov["score"] > best_cov["score"]:
+                        by_month = candidate_months
+                        best_cov = candidate_cov
+                        best_url = candidate_url
+                        best_lat = candidate_lat
+                        best_lon = candidate_lon
+                        best_dx = dx
+                        best_dy = dy
+
+                    if best_cov["wave_months"] == 12 and best_cov["water_months"] == 12:
+                        done = True
+                        break
+            if done:
                 break
 
     changed_fields = 0
@@ -391,6 +707,30 @@ def fill_file(file_path: Path, options: CliOptions, fetched_at: str) -> Dict[str
     }
 
 
+# Per-process limiter for --workers > 1 (thread locks do not cross
+# processes). main() hands each worker an equal share of --ratePerSec so the
+# pool's combined request rate stays at the configured global cap.
+_PROCESS_LIMITER: Optional[TokenBucket] = None
+
+
+def _init_process_worker(rate_per_sec: float) -> None:
+    global _PROCESS_LIMITER
+    _PROCESS_LIMITER = TokenBucket(rate_per_sec)
+
+
+def process_file_worker(args: tuple) -> tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Top-level worker for --workers > 1; must stay picklable.
+
+    Exceptions are flattened to strings because some (e.g. HTTPError) do not
+    survive the trip back through the process pool.
+    """
+    file_path, options, fetched_at = args
+    try:
+        return fill_file(file_path=file_path, options=options, fetched_at=fetched_at, limiter=_PROCESS_LIMITER), None
+    except Exception as error:
+        return None, str(error)
+
+
 def main() -> int:
     options = parse_args()
     if not options.data_dir.exists():
@@ -413,45 +753,68 @@ def main() -> int:
     print(
         f"Starting Open-Meteo marine fill: files={len(files)}, dryRun={options.dry_run}, "
         f"overwrite={options.overwrite}, includeInland={options.include_inland}, "
-        f"pauseMs={options.pause_ms}, attempts={options.attempts}"
+        f"ratePerSec={options.rate_per_sec:.2f}, attempts={options.attempts}, concurrency={options.concurrency}, "
+        f"workers={options.workers}"
     )
 
-    for index, file_path in enumerate(files, start=1):
+    # One bucket shared by every worker holds the sustained request rate,
+    # which is what makes the thread/probe parallelism safe for the API.
+    limiter = TokenBucket(options.rate_per_sec)
+
+    def run_one(file_path: Path) -> tuple[Optional[Dict[str, Any]], Optional[Exception]]:
         try:
-            result = fill_file(file_path=file_path, options=options, fetched_at=fetched_at)
+            return fill_file(file_path=file_path, options=options, fetched_at=fetched_at, limiter=limiter), None
+        except Exception as error:
+            return None, error
+
+    # map() yields in submit order, so the progress log stays stable and every
+    # file write happens on the main thread. With --workers > 1 the CPU side
+    # (JSON parse + aggregation) spreads across processes, which pays off once
+    # responses come from the on-disk cache.
+    if options.workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=options.workers,
+            initializer=_init_process_worker,
+            # Split the global rate evenly so N workers together still make
+            # at most --ratePerSec requests per second.
+            initargs=(options.rate_per_sec / options.workers,),
+        )
+        tasks = [(file_path, options, fetched_at) for file_path in files]
+        outcomes = executor.map(process_file_worker, tasks, chunksize=4)
+    else:
+        executor = ThreadPoolExecutor(max_workers=options.concurrency)
+        outcomes = executor.map(run_one, files)
+    with executor:
+        for index, (file_path, (result, error)) in enumerate(zip(files, outcomes), start=1):
+            if error is not None:
+                errors += 1
+                print(f"[{index}/{len(files)}] {file_path.name} -> ERROR: {error}")
+                continue
             if result["skipped"]:
                 skipped += 1
-                print(f"[{index}/{len(files)}] {file_path.name} -> skipped (inland)")
-            else:
-                processed += 1
-                changed_fields += result["changed_fields"]
-                changed_months += result["changed_months"]
-
-                if result["changed_fields"] > 0:
-                    changed_files += 1
-                    if not options.dry_run:
-                        file_path.write_text(
-                            f"{json.dumps(result['payload'], indent=2, ensure_ascii=True)}\n",
-                            encoding="utf-8",
-                        )
-
-                suffix = ""
-                if result.get("fallback_used"):
-                    suffix = (
-                        f", fallback=1, waveMonths={result.get('coverage_wave_months', 0)}, "
-                        f"waterMonths={result.get('coverage_water_months', 0)}"
-                    )
-                print(
-                    f"[{index}/{len(files)}] {file_path.name} -> "
-                    f"{'updated' if result['changed_fields'] > 0 else 'unchanged'} "
-                    f"(fields={result['changed_fields']}, months={result['changed_months']}{suffix})"
-                )
-        except Exception as error:
-            errors += 1
-            print(f"[{index}/{len(files)}] {file_path.name} -> ERROR: {error}")
+                print(f"[{index}/{len(files)}] {file_path.name} -> skipped ({result.get('skip_reason', 'inland')})")
+                continue
+
+            processed += 1
+            changed_fields += result["changed_fields"]
+            changed_months += result["changed_months"]
+
+            if result["changed_fields"] > 0:
+                changed_files += 1
+                if not options.dry_run:
+                    atomic_write_json(file_path, result["payload"])
 
-        if options.pause_ms > 0 and index < len(files):
-            time.sleep(options.pause_ms / 1000.0)
+            suffix = ""
+            if result.get("fallback_used"):
+                suffix = (
+                    f", fallback=1, waveMonths={result.get('coverage_wave_months', 0)}, "
+                    f"waterMonths={result.get('coverage_water_months', 0)}"
+                )
+            print(
+                f"[{index}/{len(files)}] {file_path.name} -> "
+                f"{'updated' if result['changed_fields'] > 0 else 'unchanged'} "
+                f"(fields={result['changed_fields']}, months={result['changed_months']}{suffix})"
+            )
 
     print("Open-Meteo marine fill summary:")
     print(f"- processed: {processed}")